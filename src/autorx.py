@@ -1,16 +1,36 @@
-import json
+import functools
 import logging
+import select
 import socket
+import sys
+import time
 import traceback
 from collections.abc import Callable
 from datetime import datetime, timezone
 from threading import Thread
-from typing import Any, Dict, Optional, Self, Tuple
+from typing import Any, Dict, List, Optional, Self, Tuple
 
-import geopy.distance
+from . import geo
+
+try:
+    import orjson as json # Optional, faster JSON parser
+except ImportError:
+    import json
+
+RECV_BUFFER_SIZE = 1024 # Maximum size of a single UDP packet in bytes
+RECV_BATCH_SIZE = 64 # Maximum amount of packets to read from the socket per wakeup
+RECV_SOCKET_BUFFER_SIZE = 4*1024*1024 # Requested kernel receive buffer size in bytes
+
+@functools.lru_cache(maxsize=256)
+def _parse_frequency(frequency: str) -> float:
+    """Parse an AutoRX frequency string (e.g. "403.000 MHz") to a float in MHz"""
+
+    return float(frequency[:-4])
 
 
 class SondeFrame:
+    __slots__ = ("serial", "frame", "latitude", "longitude", "altitude", "model", "frequency", "time_ns", "monotonic_ns")
+
     def __init__(
             self,
             serial: str,
@@ -20,7 +40,8 @@ class SondeFrame:
             altitude: int,
             model: str,
             frequency: float,
-            rx_time: Optional[datetime] = None,
+            rx_time_ns: Optional[int] = None,
+            rx_monotonic_ns: Optional[int] = None,
         ) -> None:
         self.serial = serial
         self.frame = frame_num
@@ -29,7 +50,17 @@ class SondeFrame:
         self.altitude = altitude # meters
         self.model = model
         self.frequency = frequency # MHz
-        self.time = rx_time
+        self.time_ns = rx_time_ns # nanoseconds since epoch
+        self.monotonic_ns = rx_monotonic_ns # monotonic clock in nanoseconds, used for age calculations
+
+    @property
+    def time(self) -> Optional[datetime]:
+        """RX time of the frame as a datetime, only constructed when needed"""
+
+        if self.time_ns is None:
+            return None
+
+        return datetime.fromtimestamp(self.time_ns / 1e9, timezone.utc)
 
     def calculate_distance(self, observer: Tuple[float, float]) -> float:
         """
@@ -37,23 +68,20 @@ class SondeFrame:
         Returns distance in meters.
         """
     
-        return geopy.distance.geodesic(
-            observer,
-            (self.latitude, self.longitude)
-        ).m
+        return geo.geodesic_distance(observer, (self.latitude, self.longitude))
 
     @classmethod
     def from_autorx(cls, payload_summary: Dict[str, Any]) -> Self:
         """Initialize a SondeFrame from an AutoRX UDP payload summary"""
 
         return cls(
-            serial=payload_summary["callsign"],
+            serial=sys.intern(payload_summary["callsign"]),
             frame_num=payload_summary["frame"],
             latitude=payload_summary["latitude"],
             longitude=payload_summary["longitude"],
             altitude=payload_summary["altitude"],
-            model=payload_summary["model"],
-            frequency=float(payload_summary["freq"][:-4])
+            model=sys.intern(payload_summary["model"]),
+            frequency=_parse_frequency(payload_summary["freq"])
             # Can't set RX time from the payload summary due to leap seconds and missing date
         )
 
@@ -68,12 +96,80 @@ class AutoRXListener():
         self._listener_thread = None
         self._socket = None
 
+        # Socket pair used to wake up the listener thread when closing it
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+
+    def _set_receive_buffer(self):
+        """Enlarge the socket receive buffer, so bursts of packets aren't dropped by the kernel"""
+
+        assert self._socket is not None # impossible, just to make typechecker happy
+
+        # SO_RCVBUFFORCE ignores the net.core.rmem_max limit, but requires CAP_NET_ADMIN
+        try:
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUFFORCE, RECV_SOCKET_BUFFER_SIZE) # type: ignore[attr-defined]
+        except (AttributeError, OSError):
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_SOCKET_BUFFER_SIZE)
+
+        # Linux reports double the requested size, as it includes bookkeeping overhead
+        granted_size = self._socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        if sys.platform.startswith("linux"):
+            granted_size //= 2
+        logging.debug("AutoRX listener socket receive buffer size: %s bytes", granted_size)
+        if granted_size < RECV_SOCKET_BUFFER_SIZE:
+            logging.info("AutoRX listener socket receive buffer was limited to %s bytes by the system. " \
+                         "On linux, the limit can be raised with sysctl net.core.rmem_max", granted_size)
+
+    def _receive_batch(self) -> List[bytes]:
+        """Read all queued packets (up to RECV_BATCH_SIZE) from the socket without blocking"""
+
+        assert self._socket is not None # impossible, just to make typechecker happy
+
+        datagrams = []
+        while len(datagrams) < RECV_BATCH_SIZE:
+            try:
+                datagrams.append(self._socket.recv(RECV_BUFFER_SIZE))
+            except BlockingIOError: # No more packets queued
+                break
+
+        return datagrams
+
+    def _drain_wakeup(self):
+        """Discard all pending wakeup bytes sent by close()"""
+
+        try:
+            while self._wake_r.recv(64):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _handle_datagram(self, datagram: bytes):
+        """Parse a single UDP packet from autorx and pass payload summaries to the callback"""
+
+        # Cheap check to skip decoding packets that can't be payload summaries
+        if b"PAYLOAD_SUMMARY" not in datagram:
+            return
+
+        # Parse payload summary and set time
+        try:
+            packet = json.loads(datagram)
+            if packet["type"] != "PAYLOAD_SUMMARY":
+                return
+
+            sonde_frame = SondeFrame.from_autorx(packet)
+            sonde_frame.time_ns = time.time_ns()
+            sonde_frame.monotonic_ns = time.monotonic_ns()
+        except (ValueError, KeyError, TypeError) as e: # JSON decode errors are ValueErrors
+            logging.error("Error while parsing AutoRX UDP payload summary: %s", e)
+        else:
+            self.callback(sonde_frame)
+
     def _listen(self):
         """Listen for payload summaries from autorx"""
 
         # Configure socket
         self._socket = socket.socket(socket.AF_INET,socket.SOCK_DGRAM)
-        self._socket.settimeout(1)
+        self._socket.setblocking(False)
         self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         try:
             self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
@@ -81,29 +177,25 @@ class AutoRXListener():
             pass
         
         try:
+            self._set_receive_buffer()
+
             # Bind socket
             self._socket.bind((self.autorx_host, self.autorx_port))
 
             # Start listening for packets
             logging.info(f"Started AutoRX listener on {self.autorx_host}:{self.autorx_port}")
-            self._run_listener = True
             while self._run_listener:
-                # Try to receive a packet
-                try:
-                    packet = json.loads(self._socket.recvfrom(1024)[0])
-                    if packet["type"] == "PAYLOAD_SUMMARY":
-                        # Parse payload summary and set time
-                        try:
-                            sonde_frame = SondeFrame.from_autorx(packet)
-                            sonde_frame.time = datetime.now(timezone.utc)
-                        except Exception as e:
-                            logging.error("Error while parsing AutoRX UDP payload summary: "+str(e))
-                        else:
-                            self.callback(sonde_frame)
-                except socket.timeout:
-                    pass
+                # Wait for packets to arrive or for the listener to be woken up by close()
+                readable, _, _ = select.select([self._socket, self._wake_r], [], [])
+                if self._wake_r in readable:
+                    self._drain_wakeup()
+                    continue
+
+                # Handle all packets that were queued since the last wakeup
+                for datagram in self._receive_batch():
+                    self._handle_datagram(datagram)
         except (KeyboardInterrupt, Exception) as e:
-            logging.error("Caught exception while running AutoRX listener: "+str(e))
+            logging.error("Caught exception while running AutoRX listener: %s", e)
             logging.info(traceback.format_exc())
             self.close()
 
@@ -111,6 +203,7 @@ class AutoRXListener():
         """Start the AutoRX listener thread"""
 
         if self._listener_thread is None:
+            self._run_listener = True # Set before starting so an early close() can't be missed
             self._listener_thread = Thread(target=self._listen)
             self._listener_thread.start()
 
@@ -119,6 +212,7 @@ class AutoRXListener():
 
         if self._listener_thread is not None:
             self._run_listener = False
+            self._wake_w.send(b"\0") # Wake up listener thread so it notices immediately
 
             # This won't work if this thread is calling the function
             try:
@@ -1,36 +1,38 @@
 import logging
 import os
-from typing import Any, Dict, Set
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple
 
 import tomllib
 
-_config_data: dict = {} # internal variable to store read config data
+_config_data: Optional[Mapping[str, Any]] = None # internal variable to store read config data
 
-def _extract_toml_keys(input_dict: Dict[str, Dict[str, Any]]) -> Dict[str, Set[str]]:
-    """Return all keys available keys in a TOML file."""
+class ConfigError(Exception):
+    """Raised when the config file is missing or contains invalid values"""
 
-    keys = {}
-    for k, v in input_dict.items():
-        keys[k] = set(v.keys())
+def _extract_toml_keys(input_dict: Dict[str, Dict[str, Any]]) -> FrozenSet[Tuple[str, str]]:
+    """Return all keys available in a TOML file as (table, key) pairs."""
 
-    return keys
+    return frozenset((table, key) for table, values in input_dict.items() for key in values)
 
-def read_config() -> Dict[str, Any]:
-    """Read and parse the config file. Will only read file once, and after that always return the previously read config values."""
+def read_config() -> Mapping[str, Any]:
+    """
+    Read and parse the config file. Will only read file once, and after that always return the previously read config values.
+    The returned top-level mapping is read-only, but the tables in it are regular dicts and must not be modified.
+    """
 
     global _config_data
 
     # Only read once for each program run
-    if _config_data == {}:
+    if _config_data is None:
         # Check if config file exists
         if not os.path.exists("config.toml"):
-            logging.error("Couldn't find config file 'config.toml'!")
-            exit(1)
+            raise ConfigError("Couldn't find config file 'config.toml'!")
 
         # Read config file
         logging.debug("Reading config file")
         with open("config.toml", "rb") as f:
-            _config_data = tomllib.load(f)
+            config_data = tomllib.load(f)
 
         if not os.path.exists("config.example.toml"): # If example config file doesn't exist, warn user and skip check.
             logging.warning("Couldn't find example config file! Program will still continue, but the check for invalid keys in the config file will be skipped.")
@@ -40,12 +42,17 @@ def read_config() -> Dict[str, Any]:
                 config_example_data = tomllib.load(f)
 
             # Extract keys
-            config_keys = _extract_toml_keys(_config_data)
+            config_keys = _extract_toml_keys(config_data)
             config_example_keys = _extract_toml_keys(config_example_data)
 
             # Compare keys
-            if config_keys != config_example_keys:
-                logging.error("Config file contains unexpected keys. Either the config file or the example config file contain invalid keys.")
-                exit(1)
+            mismatched_keys = config_keys ^ config_example_keys
+            if mismatched_keys:
+                raise ConfigError(
+                    "Config file contains unexpected keys. Either the config file or the example config file contain invalid keys. "
+                    "Mismatched keys: " + ", ".join(sorted(f"{table}.{key}" for table, key in mismatched_keys))
+                )
+
+        _config_data = MappingProxyType(config_data)
 
     return _config_data
\ No newline at end of file
@@ -0,0 +1,44 @@
+import math
+from typing import Tuple
+
+try:
+    from geors.distance import geodesic # Optional, much faster rust implementation
+except ImportError:
+    from geopy.distance import geodesic
+
+EARTH_RADIUS = 6371008.8 # Mean earth radius in meters
+HAVERSINE_MAX_ERROR = 0.01 # Maximum relative error of HaversineObserver.distance compared to geodesic distances (with margin)
+
+def geodesic_distance(point1: Tuple[float, float], point2: Tuple[float, float]) -> float:
+    """
+    Calculate the exact distance between two points (lat, lon) on the WGS-84 ellipsoid.
+    Returns distance in meters.
+    """
+
+    return geodesic(point1, point2).m
+
+class HaversineObserver:
+    """
+    Fixed observer point (lat, lon) for repeated haversine distance calculations.
+    The observer's trigonometry is only computed once instead of on every call.
+    """
+
+    __slots__ = ("lat", "lon", "cos_lat")
+
+    def __init__(self, position: Tuple[float, float]) -> None:
+        self.lat = math.radians(position[0])
+        self.lon = math.radians(position[1])
+        self.cos_lat = math.cos(self.lat)
+
+    def distance(self, latitude: float, longitude: float) -> float:
+        """
+        Calculate the haversine distance from the observer to a point (lat, lon) on a spherical earth.
+        Much faster than a geodesic calculation, but less accurate (see HAVERSINE_MAX_ERROR).
+        Returns distance in meters.
+        """
+
+        lat, lon = math.radians(latitude), math.radians(longitude)
+
+        a = math.sin((lat - self.lat) / 2)**2 + self.cos_lat * math.cos(lat) * math.sin((lon - self.lon) / 2)**2
+
+        return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
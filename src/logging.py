@@ -1,7 +1,7 @@
 import logging
 import platform
 import sys
-from typing import Any, Dict
+from typing import Any, Mapping
 
 
 class CustomFormatter(logging.Formatter):
@@ -26,16 +26,27 @@ class CustomFormatter(logging.Formatter):
             logging.DEBUG:   ("D", ""),  # no color
         }
 
+        # Build formatters once instead of for every record
+        self._formatters = {
+            levelno: logging.Formatter(self._get_format(color), "%H:%M:%S")
+            for levelno, (_, color) in self.LEVEL_MAP.items()
+        }
+        self._fallback_formatter = logging.Formatter(self._get_format(""), "%H:%M:%S")
+
+    def _get_format(self, color: str) -> str:
+        """Get the format string for a specific color"""
+
+        if self.use_color:
+            return color + self.FORMAT + self.RESET
+
+        return self.FORMAT
+
     def format(self, record):
-        levelno = record.levelno
-        char, color = self.LEVEL_MAP.get(levelno, ("?", ""))
+        char, _ = self.LEVEL_MAP.get(record.levelno, ("?", ""))
 
         # Inject new attributes into the record
         record.levelchar = char
-        fmt = self.FORMAT
-        if self.use_color:
-            fmt = color + self.FORMAT + self.RESET
-        formatter = logging.Formatter(fmt, "%H:%M:%S")
+        formatter = self._formatters.get(record.levelno, self._fallback_formatter)
 
         return formatter.format(record)
 
@@ -48,7 +59,7 @@ def handle_uncaught(exc_type, exc_value, exc_tb):
 
 _app_name = "N_A" # Internal variable used for storing the app name specified in set_up_logging
 
-def set_logging_config(config: Dict[str, Dict[str, Any]]):
+def set_logging_config(config: Mapping[str, Any]):
     """
     Set additional logging settings according to the config file.
     App name used for file name has to be specified in set_up_logging
@@ -1,13 +1,35 @@
+import argparse
+import logging as std_logging # The project's logging module below shadows the standard library one
+import signal
+import sys
+
 from . import config, logging, notifier
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Get notified of incoming sondes using data from an AutoRX instance")
+    parser.add_argument("--check-config", action="store_true", help="Only check the config file for errors and exit")
+    args = parser.parse_args()
+
     logging.set_up_logging("sonde-notifier") # Set up logging
 
-    conf = config.read_config() # Read config
-    logging.set_logging_config(conf) # Set logging config
+    try:
+        conf = config.read_config() # Read config
+        if not args.check_config:
+            logging.set_logging_config(conf) # Set logging config
+
+        app = notifier.Notifier(conf) # Also validates range rings and notification service options
+    except config.ConfigError as e:
+        std_logging.error("Invalid config: %s", e)
+        sys.exit(1)
+
+    if args.check_config: # No threads are started until run(), so it's fine to just return here
+        std_logging.info("Config file is valid")
+        return
+
+    # Stop gracefully on SIGTERM (e.g. from systemd), so queued notifications are still sent
+    signal.signal(signal.SIGTERM, lambda signum, frame: app.stop())
 
-    app = notifier.Notifier(conf)
     app.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,9 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+REQUEST_TIMEOUT = 5 # Timeout in seconds for notification requests
+
+# Session shared by all HTTP based notification services, so connections are pooled and reused
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
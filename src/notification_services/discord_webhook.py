@@ -1,3 +1,4 @@
+import logging
 from typing import Any, Dict
 
 import requests
@@ -6,6 +7,7 @@ from ..notifier import RangeRing
 from ..autorx import SondeFrame
 from ..prediction import LandingPrediction
 
+from ._http import REQUEST_TIMEOUT, SESSION
 from .notification_service import NotificationService
 
 
@@ -17,12 +19,16 @@ class DiscordWebhookNotifier(NotificationService):
     def _send_notification(self, text: str) -> None:
         text = text + "\n" + self.mentions
 
-        requests.post(
-            self.url,
-            json={
-                "content": text
-            }
-        )
+        try:
+            SESSION.post(
+                self.url,
+                json={
+                    "content": text
+                },
+                timeout=REQUEST_TIMEOUT
+            )
+        except requests.RequestException as e:
+            logging.error("Failed to send Discord webhook notification: %s", e)
 
     def notify_rangering(
             self,
@@ -30,7 +36,7 @@ class DiscordWebhookNotifier(NotificationService):
             triggered_ring: RangeRing,
             distance: float # meters
         ) -> None:
-        notification_text = f"An {latest_frame.model} sonde has triggered range ring {triggered_ring.name}. (Serial: {latest_frame.serial})"
+        notification_text = self._RING_TEXT.format(model=latest_frame.model, ring_name=triggered_ring.name, serial=latest_frame.serial)
 
         self._send_notification(notification_text)
 
@@ -42,6 +48,6 @@ class DiscordWebhookNotifier(NotificationService):
             prediction_distance: float, # meters
             latest_distance: float # meters
         ) -> None:
-        notification_text = f"A landing prediction for an {latest_frame.model} sonde has triggered range ring {triggered_ring.name}. (Serial: {latest_frame.serial})"
+        notification_text = self._PREDICTION_TEXT.format(model=latest_frame.model, ring_name=triggered_ring.name, serial=latest_frame.serial)
         
         self._send_notification(notification_text)
@@ -1,16 +1,55 @@
 import logging
 import smtplib
 import ssl
-from typing import Any, Dict
+import threading
+from email.message import EmailMessage
+from typing import Any, Dict, Optional
 
 from ..notifier import RangeRing
 from ..autorx import SondeFrame
+from ..config import ConfigError
 from ..prediction import LandingPrediction
 
 from .notification_service import NotificationService
 
+SMTP_TIMEOUT = 10 # Timeout in seconds for SMTP connections and commands
+
 
 class EmailNotifier(NotificationService):
+    _RING_TITLE = "{model} sonde triggered range ring {ring_name}"
+    _RING_CONTENT = """
+Serial:    {serial}
+Type:      {model}
+Distance:  {distance}km (treshold: {ring_range}km)
+Altitude:  {altitude}m (treshold: {ring_max_altitude}m)
+Frequency: {frequency} MHz
+Position:  {latitude} {longitude}
+
+Track on Sondehub:
+https://sondehub.org/{serial}
+"""
+
+    _PREDICTION_TITLE = "{model} sonde landing prediction triggered range ring {ring_name}"
+    _PREDICTION_CONTENT = """
+Serial:    {serial}
+Type:      {model}
+Frequency: {frequency} MHz
+
+Predicted data
+Landing Time:      {landing_time}
+Landing Distance:  {landing_distance}km (treshold: {ring_range}km)
+Landing Altitude:  {landing_altitude}m (treshold: {ring_max_altitude}m)
+Landing Position:  {landing_latitude} {landing_longitude}
+
+Current data
+Distance:  {distance}km (treshold: {ring_range}km)
+Altitude:  {altitude}m (treshold: {ring_max_altitude}m)
+Position:  {latitude} {longitude}
+
+Track on Sondehub:
+https://sondehub.org/{serial}
+"""
+
     def __init__(self, config: Dict[str, Any]) -> None:
         self.smtp_host = config["smtp_host"]
         self.smtp_port = config["smtp_port"]
@@ -20,29 +59,80 @@ class EmailNotifier(NotificationService):
         self.sender = config["sender"]
         self.destinations = config["destinations"]
 
+        self._server: Optional[smtplib.SMTP] = None # Kept open between notifications
+        self._server_lock = threading.Lock() # Notifications may be sent from multiple threads
+
         # Verify that auth is one of the valid choices
         if (self.smtp_auth != "none") and (self.smtp_auth != "ssl") and (self.smtp_auth != "tls"):
-            logging.error(f"Invalid SMTP authentication option '{self.smtp_auth}'")
-            exit(1)
+            raise ConfigError(f"Invalid SMTP authentication option '{self.smtp_auth}'")
+
+    def _connect(self) -> smtplib.SMTP:
+        """Internal function to connect and log in to the SMTP server"""
 
-    def _send_notification(self, title: str, content: str) -> None:
         # Connect to server unencrypted to with SSL
-        ssl_context = None
         if self.smtp_auth == "ssl":
             ssl_context = ssl.create_default_context()
-            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, context=ssl_context)
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, context=ssl_context, timeout=SMTP_TIMEOUT)
         else:
-            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-        
-        # Log in and send emails
-        try:
-            server.login(self.smtp_login, self.smtp_password)
-            
-            for destination in self.destinations:
-                logging.debug(f"Sending mail to {destination}")
-                server.sendmail(self.sender, destination, "Subject: "+title+"\n\n"+content) 
-        except Exception as e:
-            logging.error("Encountered exception while connected to SMTP server: "+str(e))
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=SMTP_TIMEOUT)
+
+        server.login(self.smtp_login, self.smtp_password)
+
+        return server
+
+    def _disconnect(self):
+        """Internal function to close the current SMTP connection, if there is one"""
+
+        if self._server is not None:
+            self._server.close() # Don't send QUIT, as the connection is usually broken when this is called
+            self._server = None
+
+    def _send_notification(self, title: str, content: str) -> None:
+        message = EmailMessage()
+        message["Subject"] = title
+        message["From"] = self.sender
+        message["To"] = self.sender # Destinations are only added as recipients, so they don't see each other
+        message.set_content(content)
+
+        # Send one mail to all destinations, reusing the connection from previous notifications if possible
+        with self._server_lock:
+            try:
+                if self._server is None:
+                    self._server = self._connect()
+
+                logging.debug("Sending mail to %s", ", ".join(self.destinations))
+                try:
+                    self._server.send_message(message, self.sender, self.destinations)
+                except smtplib.SMTPServerDisconnected:
+                    # Server closed the connection since the last notification, reconnect and try again
+                    logging.debug("SMTP server closed connection, reconnecting")
+                    self._disconnect()
+                    self._server = self._connect()
+                    self._server.send_message(message, self.sender, self.destinations)
+            except Exception as e:
+                logging.error("Encountered exception while connected to SMTP server: %s", e)
+                self._disconnect()
+
+    def _frame_values(self, latest_frame: SondeFrame) -> Dict[str, Any]:
+        """Internal function to get the template values of a sonde frame"""
+
+        return {
+            "serial": latest_frame.serial,
+            "model": latest_frame.model,
+            "frequency": round(latest_frame.frequency, 2),
+            "latitude": round(latest_frame.latitude, 5),
+            "longitude": round(latest_frame.longitude, 5),
+            "altitude": round(latest_frame.altitude, 0)
+        }
+
+    def _ring_values(self, triggered_ring: RangeRing) -> Dict[str, Any]:
+        """Internal function to get the template values of a range ring"""
+
+        return {
+            "ring_name": triggered_ring.name,
+            "ring_range": round(triggered_ring.range/1000, 1),
+            "ring_max_altitude": round(triggered_ring.max_altitude, 1)
+        }
 
     def notify_rangering(
             self,
@@ -50,20 +140,10 @@ class EmailNotifier(NotificationService):
             triggered_ring: RangeRing,
             distance: float # meters
         ) -> None:
-        title = f"{latest_frame.model} sonde triggered range ring {triggered_ring.name}"
-        content = f"""
-Serial:    {latest_frame.serial}
-Type:      {latest_frame.model}
-Distance:  {round(distance/1000, 1)}km (treshold: {round(triggered_ring.range, 1)}km)
-Altitude:  {round(latest_frame.altitude, 0)}m (treshold: {round(triggered_ring.max_altitude, 1)}m)
-Frequency: {round(latest_frame.frequency, 2)} MHz
-Position:  {round(latest_frame.latitude, 5)} {round(latest_frame.longitude, 5)}
-        
-Track on Sondehub:
-https://sondehub.org/{latest_frame.serial}
-"""
+        values = self._frame_values(latest_frame) | self._ring_values(triggered_ring)
+        values["distance"] = round(distance/1000, 1)
 
-        self._send_notification(title, content)
+        self._send_notification(self._RING_TITLE.format_map(values), self._RING_CONTENT.format_map(values))
 
     def notify_rangering_prediction(
             self,
@@ -73,26 +153,12 @@ https://sondehub.org/{latest_frame.serial}
             prediction_distance: float, # meters
             latest_distance: float # meters
         ) -> None:
-        title = f"{latest_frame.model} sonde landing prediction triggered range ring {triggered_ring.name}"
-        content = f"""
-Serial:    {latest_frame.serial}
-Type:      {latest_frame.model}
-Frequency: {round(latest_frame.frequency, 2)} MHz
-        
-Predicted data
-Landing Time:      {landing_prediction.landing_time.strftime("%Y-%m-%d %H:%M:%SZ")}
-Landing Distance:  {round(prediction_distance/1000, 1)}km (treshold: {round(triggered_ring.range, 1)}km)
-Landing Altitude:  {round(landing_prediction.altitude, 0)}m (treshold: {round(triggered_ring.max_altitude, 1)}m)
-Landing Position:  {round(landing_prediction.latitude, 5)} {round(landing_prediction.longitude, 5)}
-        
-Current data
-Distance:  {round(latest_distance/1000, 1)}km (treshold: {round(triggered_ring.range, 1)}km)
-Altitude:  {round(latest_frame.altitude, 0)}m (treshold: {round(triggered_ring.max_altitude, 1)}m)
-Position:  {round(latest_frame.latitude, 5)} {round(latest_frame.longitude, 5)}
-
-Track on Sondehub:
-https://sondehub.org/{latest_frame.serial}
-"""
-
-        self._send_notification(title, content)
+        values = self._frame_values(latest_frame) | self._ring_values(triggered_ring)
+        values["distance"] = round(latest_distance/1000, 1)
+        values["landing_time"] = landing_prediction.landing_time.strftime("%Y-%m-%d %H:%M:%SZ")
+        values["landing_distance"] = round(prediction_distance/1000, 1)
+        values["landing_altitude"] = round(landing_prediction.altitude, 0)
+        values["landing_latitude"] = round(landing_prediction.latitude, 5)
+        values["landing_longitude"] = round(landing_prediction.longitude, 5)
 
+        self._send_notification(self._PREDICTION_TITLE.format_map(values), self._PREDICTION_CONTENT.format_map(values))
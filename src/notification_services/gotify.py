@@ -1,3 +1,4 @@
+import logging
 from typing import Any, Dict
 from urllib.parse import urljoin
 
@@ -7,6 +8,7 @@ from ..notifier import RangeRing
 from ..autorx import SondeFrame
 from ..prediction import LandingPrediction
 
+from ._http import REQUEST_TIMEOUT, SESSION
 from .notification_service import NotificationService
 
 
@@ -15,13 +17,17 @@ class GotifyNotifier(NotificationService):
         self.url = urljoin(config["url"], f"/message?{config['app_token']}")
 
     def _send_notification(self, title: str, message: str) -> None:
-        requests.post(
-            self.url,
-            files={
-                "title": title,
-                "message": message
-            }
-        )
+        try:
+            SESSION.post(
+                self.url,
+                files={
+                    "title": title,
+                    "message": message
+                },
+                timeout=REQUEST_TIMEOUT
+            )
+        except requests.RequestException as e:
+            logging.error("Failed to send Gotify notification: %s", e)
 
     def notify_rangering(
             self,
@@ -29,7 +35,7 @@ class GotifyNotifier(NotificationService):
             triggered_ring: RangeRing,
             distance: float # meters
         ) -> None:
-        notification_text = f"An {latest_frame.model} sonde has triggered range ring {triggered_ring.name}. (Serial: {latest_frame.serial})"
+        notification_text = self._RING_TEXT.format(model=latest_frame.model, ring_name=triggered_ring.name, serial=latest_frame.serial)
 
         self._send_notification("Sonde Notification", notification_text)
 
@@ -41,6 +47,6 @@ class GotifyNotifier(NotificationService):
             prediction_distance: float, # meters
             latest_distance: float # meters
         ) -> None:
-        notification_text = f"A landing prediction for an {latest_frame.model} sonde has triggered range ring {triggered_ring.name}. (Serial: {latest_frame.serial})"
+        notification_text = self._PREDICTION_TEXT.format(model=latest_frame.model, ring_name=triggered_ring.name, serial=latest_frame.serial)
         
         self._send_notification("Sonde Prediction Notification", notification_text)
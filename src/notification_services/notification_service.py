@@ -6,6 +6,10 @@ from ..autorx import SondeFrame
 from ..prediction import LandingPrediction
 
 class NotificationService(ABC):
+    # Short notification texts used by services without rich formatting
+    _RING_TEXT = "An {model} sonde has triggered range ring {ring_name}. (Serial: {serial})"
+    _PREDICTION_TEXT = "A landing prediction for an {model} sonde has triggered range ring {ring_name}. (Serial: {serial})"
+
     @abstractmethod
     def __init__(self, config: Dict[str, Any]) -> None:
         pass
@@ -8,6 +8,7 @@ from ..notifier import RangeRing
 from ..autorx import SondeFrame
 from ..prediction import LandingPrediction
 
+from ._http import REQUEST_TIMEOUT, SESSION
 from .notification_service import NotificationService
 
 
@@ -15,37 +16,41 @@ class NtfyNotifier(NotificationService):
     def __init__(self, config: Dict[str, Any]) -> None:
         self.topic_url = config["topic_url"]
 
-        # If an auth login was specified, generate auth string
+        # If an auth login was specified, generate auth header sent with every notification
         user = config["auth_user"]
         password = config["auth_password"]
         token = config["auth_token"]
 
-        self.auth_header = ""
+        self._headers: Dict[str, str] = {}
         if token != "":
-            self.auth_header = "Bearer "+token
+            self._headers["Authorization"] = "Bearer "+token
         elif (user != "") or (password != ""):
             auth_str = user+":"+password
-            self.auth_header = "Basic "+base64.b64encode(auth_str.encode("ascii")).decode("ascii")
+            self._headers["Authorization"] = "Basic "+base64.b64encode(auth_str.encode("ascii")).decode("ascii")
 
     def _send_notification(self, text: str, sonde_serial: str = "") -> None:
-        # Prepare action header text
-        action_header = ""
+        # Add action header if a sonde serial was given
+        headers = self._headers
         if sonde_serial != "":
-            action_header = "view, View on Sondehub, https://sondehub.org/"+sonde_serial
-            print(action_header)
+            headers = headers | {"Actions": "view, View on Sondehub, https://sondehub.org/"+sonde_serial}
 
         # Send request
-        request = requests.post(
-            self.topic_url,
-            data=text.encode(),
-            headers={"Authorization": self.auth_header, "Actions": action_header}
-        )
+        try:
+            request = SESSION.post(
+                self.topic_url,
+                data=text.encode("utf-8"),
+                headers=headers,
+                timeout=REQUEST_TIMEOUT
+            )
+        except requests.RequestException as e:
+            logging.error("Failed to send NTFY notification: %s", e)
+            return
 
         # Check status code
         if request.status_code != 200:
             logging.error(f"Failed to send NTFY notification. Got status code {request.status_code}")
             if request.content:
-                logging.debug(f"Erroneous NTFY request returned: {request.content}")
+                logging.debug("Erroneous NTFY request returned: %s", request.content)
 
     def notify_rangering(
             self,
@@ -53,7 +58,7 @@ class NtfyNotifier(NotificationService):
             triggered_ring: RangeRing,
             distance: float # meters
         ) -> None:
-        notification_text = f"An {latest_frame.model} sonde has triggered range ring {triggered_ring.name}. (Serial: {latest_frame.serial})"
+        notification_text = self._RING_TEXT.format(model=latest_frame.model, ring_name=triggered_ring.name, serial=latest_frame.serial)
 
         self._send_notification(notification_text, latest_frame.serial)
 
@@ -65,7 +70,7 @@ class NtfyNotifier(NotificationService):
             prediction_distance: float, # meters
             latest_distance: float # meters
         ) -> None:
-        notification_text = f"A landing prediction for an {latest_frame.model} sonde has triggered range ring {triggered_ring.name}. (Serial: {latest_frame.serial})"
+        notification_text = self._PREDICTION_TEXT.format(model=latest_frame.model, ring_name=triggered_ring.name, serial=latest_frame.serial)
         
         self._send_notification(notification_text, latest_frame.serial)
 
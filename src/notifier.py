@@ -1,56 +1,93 @@
-import copy
+import bisect
+import concurrent.futures
 import logging
+import queue
 import time
 import traceback
-from collections import defaultdict, deque
+from collections.abc import Callable
 from datetime import datetime, timezone
-from threading import Lock
-from typing import Any, Dict, List, Literal, Optional, Self, Tuple
+from threading import Event, Thread
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Self, Tuple
 
-from . import autorx, prediction
+from . import autorx, geo, prediction
+from .config import ConfigError
+
+if TYPE_CHECKING: # notification_services imports this module, so only import it for type checking
+    from .notification_services import NotificationService
 
 TRACKED_SONDES_MAX_SECONDS = 5*60*60
+NOTIFICATION_QUEUE_SIZE = 128 # Maximum amount of notifications waiting to be sent
+NOTIFICATION_SHUTDOWN_TIMEOUT = 30 # Seconds to wait for queued notifications to be sent when shutting down
+NOTIFICATION_SEND_TIMEOUT = 30 # Seconds to wait for all services to send a notification before moving on to the next one
+PREDICTION_WORKERS = 4 # Maximum amount of predictions requested from the prediction API at the same time
+PREDICTION_BATCH_TIMEOUT = 60 # Seconds to wait for all predictions of a check cycle before skipping the remaining ones
+DESCENT_FRAMES = 5 # Amount of most recent frames that have to be descending for a sonde to count as descending
+DESCENT_MIN_FRAMES = 3 # Minimum amount of frames needed before a sonde can count as descending
+
+_NO_NOTIFIED_RINGS: Mapping[str, int] = MappingProxyType({}) # Returned for sondes that haven't triggered any ring yet
+
+class DescentState:
+    """Tracks wether a sonde is descending, without storing its previous altitudes"""
+
+    __slots__ = ("last_altitude", "frame_count", "descending_run")
+
+    def __init__(self, altitude: float) -> None:
+        self.last_altitude = altitude
+        self.frame_count = 1 # Capped at DESCENT_FRAMES
+        self.descending_run = 0 # Consecutive frames with a lower altitude than the previous one
+
+    def update(self, altitude: float):
+        """Update the state with the altitude of a newly received frame"""
+
+        self.descending_run = self.descending_run + 1 if altitude < self.last_altitude else 0
+        self.last_altitude = altitude
+        if self.frame_count < DESCENT_FRAMES:
+            self.frame_count += 1
+
+    @property
+    def descending(self) -> bool:
+        """Wether the altitudes of the last (up to DESCENT_FRAMES) frames are all lower than the one before"""
+
+        return (self.frame_count >= DESCENT_MIN_FRAMES) and (self.descending_run >= self.frame_count - 1)
 
 class RangeRing:
-    def __init__(self, id: int, name: str, range: int, max_altitude: int, only_descending: bool, prefix: str = "") -> None:
+    __slots__ = ("id", "name", "range", "max_altitude", "only_descending")
+
+    def __init__(self, id: int, name: str, range: int, max_altitude: int, only_descending: bool) -> None:
         self.id = id
         self.name = name
         self.range = range # meters
         self.max_altitude = max_altitude # meters
         self.only_descending = only_descending
-        self.prefix = prefix
-
-    def as_string(self, type: Literal["name", "id"], prefix_overwrite: str = "") -> str:
-        """Get the current range ring as a string in the format {prefix|prefix_overwrite_}range_ring_{name|id}"""
-
-        prefix = prefix_overwrite if prefix_overwrite != "" else self.prefix # Check wether to use prefix overwrite
-        prefix = prefix + "_" if prefix != "" else prefix # Add _ if prefix is set
-
-        suffix = self.name if type == "name" else self.id # Set suffix to either name or id
-
-        return f"{prefix}range_ring_{suffix}"
 
 class Notifier:
-    def __init__(self, config: Dict[str, Any]) -> None:
+    def __init__(self, config: Mapping[str, Any]) -> None:
         logging.info("Initializing notifier")
 
         self.config = config
         self.notify_check_interval = config["notifier"]["check_interval"] * 60 # Convert to seconds
         self.only_predict_descending = config["prediction"]["only_predict_descending"]
         self.station_position = (config["station"]["latitude"], config["station"]["longitude"])
+        self._station_observer = geo.HaversineObserver(self.station_position)
 
         self.prediction_engine = None
+        self._prediction_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
         self.prediction_min_cycles = config["prediction"]["prediction_cycles"]
         self.notification_check_cycles = 1
 
-        self.sondes_altitudes = defaultdict(lambda: deque(maxlen=5))
-        self.sondes_altitudes_lock = Lock()
+        self._stop_event = Event() # Set to stop the main loop in run()
 
+        # Packets received by the AutoRX listener thread, applied to the tracked sondes by the notifier thread.
+        # This way only the notifier thread accesses sondes_descent, tracked_sondes and notified_sondes, so they need no lock.
+        self._packet_queue: queue.SimpleQueue[autorx.SondeFrame] = queue.SimpleQueue()
+
+        self.sondes_descent: Dict[str, DescentState] = {}
         self.tracked_sondes: Dict[str, autorx.SondeFrame] = {}
-        self.tracked_sondes_lock = Lock()
+        self.notified_sondes: Dict[str, Dict[str, int]] = {} # Bitmask of notified ring ids per sonde and ring prefix
 
-        self.notified_sondes = defaultdict(list)
-        self.notified_sondes_lock = Lock()
+        # Cached distance per sonde, only used by the notification check loop
+        self._sonde_distance_cache: Dict[str, Tuple[autorx.SondeFrame, float]] = {}
 
         # Set prediction engine
         if config["prediction"]["enabled"]:
@@ -61,10 +98,17 @@ class Notifier:
                 config["prediction"]["descent_rate"]
             )
 
-        # Parse range rings
+            # Predictions are run concurrently, as they are mostly waiting for the prediction API
+            self._prediction_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=PREDICTION_WORKERS,
+                thread_name_prefix="prediction"
+            )
+
+        # Parse range rings, sorted by ascending radius. IDs are assigned in sorted order.
         self.range_rings: List[RangeRing] = []
         try:
-            for id, range_ring in enumerate(config["notifier"]["range_rings"]):
+            sorted_range_rings = sorted(config["notifier"]["range_rings"], key=lambda range_ring: range_ring["radius"])
+            for id, range_ring in enumerate(sorted_range_rings):
                 self.range_rings.append(
                     RangeRing(
                         id=id,
@@ -75,12 +119,20 @@ class Notifier:
                     )
                 )
         except KeyError as e:
-            logging.error("Invalid key in range rings: "+str(e))
-            exit(1)
+            raise ConfigError(f"Invalid key in range rings: {e}") from e
 
         if len(self.range_rings) == 0:
-            logging.error("Define at least one range ring!")
-            exit(1)
+            raise ConfigError("Define at least one range ring!")
+
+        self._ring_ranges = [ring.range for ring in self.range_rings] # For binary search in _check_range_rings
+
+        # Bitmask of each ring and all larger rings (ids >= ring id), for notified_sondes
+        all_rings_mask = (1 << len(self.range_rings)) - 1
+        self._ring_suffix_masks = [all_rings_mask & ~((1 << ring.id) - 1) for ring in self.range_rings]
+
+        # Limits that a sonde has to be within to trigger any range ring
+        self._max_ring_range = max(ring.range for ring in self.range_rings)
+        self._max_ring_altitude = max(ring.max_altitude for ring in self.range_rings)
 
         # Prepare list of notification services from config
         logging.debug("Initializing notification services")
@@ -106,53 +158,134 @@ class Notifier:
         if len(self.notification_services) == 0:
             logging.warning("No notification services enabled")
 
+        # Notifications are sent from a separate thread, so slow notification services don't block checks
+        self._notification_queue: queue.Queue[Optional[Callable[[Any], None]]] = queue.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+        self._notification_thread = Thread(target=self._notification_worker, daemon=True)
+        self._notification_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(4, len(self.notification_services)),
+            thread_name_prefix="notification"
+        )
+
     def _handle_packet(self, frame: autorx.SondeFrame):
         """Internal callback function to handle payload summaries from AutoRX"""
 
-        logging.debug(f"Got packet #{frame.frame} from sonde {frame.serial}")
+        logging.debug("Got packet #%s from sonde %s", frame.frame, frame.serial)
+
+        self._packet_queue.put(frame)
+
+    def _apply_packets(self):
+        """Internal function to update the tracked sondes with all packets received since the last call"""
+
+        while True:
+            try:
+                frame = self._packet_queue.get_nowait()
+            except queue.Empty:
+                return
 
-        # Update internal list
-        with self.tracked_sondes_lock:
             # Log message if sonde is new
             if frame.serial not in self.tracked_sondes:
-                logging.info(f"Got new {frame.model} sonde: {frame.serial}")
+                logging.info("Got new %s sonde: %s", frame.model, frame.serial)
+            else:
+                del self.tracked_sondes[frame.serial] # Re-insert to keep dict ordered by receive time
 
             self.tracked_sondes[frame.serial] = frame
 
-        with self.sondes_altitudes_lock:
-            self.sondes_altitudes[frame.serial].append(frame.altitude)
+            descent = self.sondes_descent.get(frame.serial)
+            if descent is None:
+                self.sondes_descent[frame.serial] = DescentState(frame.altitude)
+            else:
+                descent.update(frame.altitude)
     
-    def _purge_old_tracked(self):
+    def _purge_old_tracked(self, now_ns: int):
         """Internal function to remove all old sondes from tracked_sondes dict"""
 
         logging.debug("Purging old sondes from tracked list")
 
+        # Check which sondes are old. tracked_sondes is ordered by receive time, so stop at the first recent sonde
         remove = []
-        with self.tracked_sondes_lock:
-            # Check which sondes are old
-            for serial, frame in self.tracked_sondes.items():
-                assert frame.time is not None # impossible, just to make typechecker happy
-                frame_age = (datetime.now(timezone.utc) - frame.time).total_seconds()
-                if frame_age >= TRACKED_SONDES_MAX_SECONDS:
-                    remove.append(serial)
-
-            # Remove old sondes
-            for serial in remove:
-                del self.tracked_sondes[serial]
-
-                # Remove from notified_sondes list if present
-                with self.notified_sondes_lock:
-                    if serial in self.notified_sondes:
-                        del self.notified_sondes[serial]
-
-                # Remove from sondes_altitudes
-                with self.sondes_altitudes_lock:
-                    del self.sondes_altitudes[serial]
-
-            # Log
-            if len(remove) > 0:
-                for serial in remove:
-                    logging.info("Removed old sonde from tracked list: "+str(serial))
+        for serial, frame in self.tracked_sondes.items():
+            assert frame.monotonic_ns is not None # impossible, just to make typechecker happy
+            frame_age = (now_ns - frame.monotonic_ns) / 1e9
+            if frame_age < TRACKED_SONDES_MAX_SECONDS:
+                break
+
+            remove.append(serial)
+
+        # Remove old sondes
+        for serial in remove:
+            del self.tracked_sondes[serial]
+
+            # Remove from notified_sondes if present
+            self.notified_sondes.pop(serial, None)
+
+            # Remove from sondes_descent
+            del self.sondes_descent[serial]
+
+            # Remove cached distance
+            self._sonde_distance_cache.pop(serial, None)
+
+            logging.info("Removed old sonde from tracked list: %s", serial)
+
+    def _queue_notification(self, send: Callable[[Any], None]):
+        """
+        Internal function to queue a notification to be sent by all notification services.
+        send is called once for every notification service. If the queue is full, the oldest notification is dropped.
+        """
+
+        while True:
+            try:
+                self._notification_queue.put_nowait(send)
+                return
+            except queue.Full:
+                try:
+                    self._notification_queue.get_nowait()
+                    logging.warning("Notification queue is full, dropping oldest notification")
+                except queue.Empty:
+                    pass
+
+    def _send_with_service(self, send: Callable[[Any], None], service: "NotificationService"):
+        """Internal function to send a notification with a single notification service, logging any exceptions"""
+
+        try:
+            send(service)
+        except Exception as e:
+            logging.error("Got exception while sending notification with %s: %s", type(service).__name__, e)
+            logging.debug(traceback.format_exc())
+
+    def _notification_worker(self):
+        """Internal function to send queued notifications, runs in a separate thread"""
+
+        while True:
+            send = self._notification_queue.get()
+            if send is None: # Sentinel queued by _stop_notification_worker
+                return
+
+            # Send with all services at once, so a slow service doesn't delay the others
+            futures = [
+                self._notification_executor.submit(self._send_with_service, send, service)
+                for service in self.notification_services
+            ]
+            _, not_done = concurrent.futures.wait(futures, timeout=NOTIFICATION_SEND_TIMEOUT)
+            if len(not_done) > 0:
+                logging.warning("%s notification services are taking too long to send a notification", len(not_done))
+
+    def _stop_notification_worker(self):
+        """Internal function to send all remaining queued notifications and stop the notification thread"""
+
+        if not self._notification_thread.is_alive():
+            return
+
+        logging.debug("Waiting for %s queued notifications to be sent", self._notification_queue.qsize())
+        try:
+            self._notification_queue.put(None, timeout=NOTIFICATION_SHUTDOWN_TIMEOUT)
+            self._notification_thread.join(timeout=NOTIFICATION_SHUTDOWN_TIMEOUT)
+        except queue.Full:
+            pass
+
+        if self._notification_thread.is_alive():
+            logging.warning("Timed out while sending queued notifications, some notifications may not have been sent")
+
+        self._notification_executor.shutdown(wait=False)
 
     def _notify_rangering(
             self,
@@ -162,10 +295,11 @@ class Notifier:
         ):
         """Internal function to send range ring notifications for a specific sonde"""
 
-        logging.info(f"Sending notifications for sonde {latest_frame.serial} triggering range ring {triggered_ring.name}")
+        logging.info("Sending notifications for sonde %s triggering range ring %s", latest_frame.serial, triggered_ring.name)
 
-        for service in self.notification_services:
-            service.notify_rangering(latest_frame, triggered_ring, distance)
+        self._queue_notification(
+            lambda service: service.notify_rangering(latest_frame, triggered_ring, distance)
+        )
 
     def _notify_rangering_prediction(
             self,
@@ -177,16 +311,31 @@ class Notifier:
         ):
         """Internal function to send range ring notifications for a specific sonde"""
 
-        logging.info(f"Sending notifications for prediction of sonde {latest_frame.serial} triggering range ring {triggered_ring.name}")
+        logging.info("Sending notifications for prediction of sonde %s triggering range ring %s", latest_frame.serial, triggered_ring.name)
 
-        for service in self.notification_services:
-            service.notify_rangering_prediction(
+        self._queue_notification(
+            lambda service: service.notify_rangering_prediction(
                 latest_frame,
                 landing_prediction,
                 triggered_ring,
                 prediction_distance,
                 latest_distance
             )
+        )
+
+    def _calculate_sonde_distance(self, frame: autorx.SondeFrame) -> float:
+        """
+        Internal function to calculate the distance from the station to a sonde.
+        Uses the fast haversine distance, unless the sonde is close enough to a range ring border that its error matters.
+        """
+
+        distance = self._station_observer.distance(frame.latitude, frame.longitude)
+
+        for ring in self.range_rings:
+            if abs(distance - ring.range) <= ring.range * geo.HAVERSINE_MAX_ERROR:
+                return frame.calculate_distance(self.station_position)
+
+        return distance
 
     def _check_range_rings(
             self,
@@ -198,9 +347,18 @@ class Notifier:
         ) -> RangeRing | None:
         """Internal function to check for range ring hits for a specified sonde"""
 
-        for ring in self.range_rings:
+        # Skip checking each ring if sonde is outside of all of them
+        if (distance > self._max_ring_range) or (altitude > self._max_ring_altitude):
+            return None
+
+        # Don't use notified_sondes[serial] here, as that would insert an entry for this serial
+        notified = self.notified_sondes.get(serial, _NO_NOTIFIED_RINGS).get(ring_prefix, 0)
+
+        # Only check rings that are large enough to contain the sonde
+        first_ring = bisect.bisect_left(self._ring_ranges, distance)
+        for ring in self.range_rings[first_ring:]:
             # Skip already triggered rings
-            if ring.as_string("id", ring_prefix) in self.notified_sondes[serial]:
+            if notified & (1 << ring.id):
                 continue
 
             # Skip if ring only allows descending sondes and sonde is not descending
@@ -208,21 +366,16 @@ class Notifier:
                 continue
 
             # Check if ring should be triggered
-            if (int(distance) <= ring.range) and (int(altitude) <= ring.max_altitude):
-                # Return ring with correct prefix
-                ring = copy.deepcopy(ring)
-                ring.prefix = ring_prefix
-
+            if (distance <= ring.range) and (altitude <= ring.max_altitude):
                 return ring # Only return ring with smallest radius (range_rings list is sorted by asc. radius)
 
         return None
     
-    def _set_ring_notified(self, serial: str, notified_ring: RangeRing):
+    def _set_ring_notified(self, serial: str, notified_ring: RangeRing, ring_prefix: str = ""):
         """Internal function to add a ring and all larger rings to the notified list of a sondes"""
 
-        for ring in self.range_rings:
-            if ring.id >= notified_ring.id:
-                self.notified_sondes[serial].append(ring.as_string("id", notified_ring.prefix))
+        notified = self.notified_sondes.setdefault(serial, {})
+        notified[ring_prefix] = notified.get(ring_prefix, 0) | self._ring_suffix_masks[notified_ring.id]
 
     def _check_notifications(self):
         """Internal function to check if notifications need to be sent"""
@@ -233,88 +386,123 @@ class Notifier:
         run_prediction = False
         if self.prediction_engine is not None:
             if self.notification_check_cycles < self.prediction_min_cycles:
-                status = f"{self.notification_check_cycles}/{self.prediction_min_cycles}"
-                logging.debug(status+" check cycles for prediction")
+                logging.debug("%s/%s check cycles for prediction", self.notification_check_cycles, self.prediction_min_cycles)
             else:
                 self.notification_check_cycles = 0
                 run_prediction = True
 
-        with self.tracked_sondes_lock and self.notified_sondes_lock and self.sondes_altitudes_lock:
-            for serial, frame in self.tracked_sondes.items():
-                # Determine wether sonde is descending or not
-                altitudes = self.sondes_altitudes[serial]
-                if len(altitudes) < 3:
-                    is_descending = False # Assume sonde is rising if there are less than 3 received frames
-                else:
-                    is_descending = all(altitudes[i] > altitudes[i+1] for i in range(len(altitudes) - 1))
-
-                # Calculate distance to sonde
-                sonde_distance = frame.calculate_distance(self.station_position)
-
-                triggered_ring = self._check_range_rings(serial, sonde_distance, frame.altitude, is_descending)
+        # Update tracked sondes with new packets, then remove old ones
+        self._apply_packets()
+        now_ns = time.monotonic_ns()
+        now = datetime.now(timezone.utc) # Prediction start time, shared by all sondes in this cycle
+        self._purge_old_tracked(now_ns)
+
+        prediction_candidates: List[Tuple[str, autorx.SondeFrame, float, bool]] = []
+        for serial, frame in self.tracked_sondes.items():
+            descent = self.sondes_descent[serial]
+            frame_count = descent.frame_count
+            is_descending = descent.descending
+
+            # Calculate distance to sonde, unless no new frame has been received since last check
+            cached = self._sonde_distance_cache.get(serial)
+            if (cached is not None) and (cached[0] is frame):
+                sonde_distance = cached[1]
+            else:
+                sonde_distance = self._calculate_sonde_distance(frame)
+                self._sonde_distance_cache[serial] = (frame, sonde_distance)
+
+            triggered_ring = self._check_range_rings(serial, sonde_distance, frame.altitude, is_descending)
+            if triggered_ring is not None:
+                # Show the exact distance in notifications, the haversine one is only good enough for checking rings
+                self._notify_rangering(frame, triggered_ring, frame.calculate_distance(self.station_position))
+                self._set_ring_notified(serial, triggered_ring)
+
+            if run_prediction:
+                assert self.prediction_engine is not None # impossible, just to make typechecker happy
+
+                # Only run if 3 frames have been received already
+                if frame_count < DESCENT_MIN_FRAMES:
+                    logging.debug("Skipping prediciton for sonde %s because not enought frames have been received", serial)
+                    continue
+
+                # Only run if a packet has been received since the last notification check cycle
+                assert frame.monotonic_ns is not None # impossible, just to make typechecker happy
+                frame_age = (now_ns - frame.monotonic_ns) / 1e9
+                if round(frame_age) > self.notify_check_interval:
+                    logging.debug("Skipping prediciton for sonde %s as last receive was too long ago", serial)
+                    continue
+
+                # If option to only predict for descending sondes is set and sonde is not descending, skip
+                if self.only_predict_descending and (not is_descending):
+                    logging.debug("Skipping prediction for sonde %s as it is not descending", serial)
+                    continue
+
+                # TODO: only run prediction if there are still notifications left for this sonde (?)
+
+                # Exact distance, as it is only shown in prediction notifications
+                latest_distance = frame.calculate_distance(self.station_position)
+                prediction_candidates.append((serial, frame, latest_distance, is_descending))
+
+        # Run predictions concurrently, as every prediction is an independent request to the prediction API
+        if len(prediction_candidates) > 0:
+            assert self.prediction_engine is not None # impossible, just to make typechecker happy
+            assert self._prediction_executor is not None # impossible, just to make typechecker happy
+
+            futures = {
+                self._prediction_executor.submit(
+                    self.prediction_engine.run_landing_prediction,
+                    now,
+                    frame.latitude,
+                    frame.longitude,
+                    frame.altitude,
+                    is_descending
+                ): (serial, frame, latest_distance, is_descending)
+                for serial, frame, latest_distance, is_descending in prediction_candidates
+            }
+
+            # Don't let a hanging prediction block range ring checks, skip predictions that take too long
+            done, not_done = concurrent.futures.wait(futures, timeout=PREDICTION_BATCH_TIMEOUT)
+            if len(not_done) > 0:
+                logging.warning("%s predictions are taking too long, skipping them this cycle", len(not_done))
+                for future in not_done:
+                    future.cancel()
+
+            for future in done:
+                serial, frame, latest_distance, is_descending = futures[future]
+                landing_prediction = future.result()
+
+                if landing_prediction is None: # Error while predicting, skip
+                    logging.warning("Prediction for sonde %s failed due to error while ", serial)
+                    continue
+
+                # Calculate distance
+                prediction_distance = landing_prediction.calculate_distance(self.station_position)
+
+                # Check for range ring hits
+                triggered_ring = self._check_range_rings(
+                    serial,
+                    prediction_distance,
+                    landing_prediction.altitude,
+                    is_descending,
+                    "prediction"
+                )
                 if triggered_ring is not None:
-                    self._notify_rangering(frame, triggered_ring, sonde_distance)
-                    self._set_ring_notified(serial, triggered_ring)
-
-                if run_prediction:
-                    assert self.prediction_engine is not None # impossible, just to make typechecker happy
-
-                    # Only run if 3 frames have been received already
-                    if len(altitudes) < 3:
-                        logging.debug(f"Skipping prediciton for sonde {serial} because not enought frames have been received")
-                        continue
-
-                    # Only run if a packet has been received since the last notification check cycle
-                    assert frame.time is not None # impossible, just to make typechecker happy
-                    frame_age = (datetime.now(timezone.utc) - frame.time).total_seconds()
-                    if round(frame_age) > self.notify_check_interval:
-                        logging.debug(f"Skipping prediciton for sonde {serial} as last receive was too long ago")
-                        continue
-
-                    # If option to only predict for descending sondes is set and sonde is not descending, skip
-                    if self.only_predict_descending and (not is_descending):
-                        logging.debug(f"Skipping prediction for sonde {serial} as it is not descending")
-                        continue
-
-                    # TODO: only run prediction if there are still notifications left for this sonde (?)
-
-                    # Run prediction
-                    now = datetime.now(timezone.utc)
-                    landing_prediction = self.prediction_engine.run_landing_prediction(
-                        now,
-                        frame.latitude,
-                        frame.longitude,
-                        frame.altitude,
-                        is_descending
-                    )
-
-                    if landing_prediction is None: # Error while predicting, skip
-                        logging.warning(f"Prediction for sonde {serial} failed due to error while ")
-                        continue
-
-                    # Calculate distance
-                    prediction_distance = landing_prediction.calculate_distance(self.station_position)
-
-                    # Check for range ring hits
-                    triggered_ring = self._check_range_rings(
-                        serial,
+                    self._notify_rangering_prediction(
+                        frame,
+                        landing_prediction,
+                        triggered_ring,
                         prediction_distance,
-                        landing_prediction.altitude,
-                        is_descending,
-                        "prediction"
+                        latest_distance
                     )
-                    if triggered_ring is not None:
-                        self._notify_rangering_prediction(
-                            frame,
-                            landing_prediction,
-                            triggered_ring,
-                            prediction_distance,
-                            sonde_distance
-                        )
-                        self._set_ring_notified(serial, triggered_ring)
+                    self._set_ring_notified(serial, triggered_ring, "prediction")
 
         self.notification_check_cycles += 1
 
+    def stop(self):
+        """Stop a running notifier. Can be called from any thread."""
+
+        self._stop_event.set()
+
     def run(self):
         """Run notifier"""
 
@@ -328,15 +516,29 @@ class Notifier:
             )
             self.autorx_listener.start()
 
+            # Start notification thread
+            self._notification_thread.start()
+
+            # Run checks on a fixed schedule, so the time spent checking doesn't delay the next check
+            next_check = time.monotonic()
             while True:
-                self._purge_old_tracked()
                 self._check_notifications()
-                time.sleep(self.notify_check_interval)
+
+                # If a check took longer than the interval, run the next one right away instead of catching up
+                next_check = max(next_check + self.notify_check_interval, time.monotonic())
+                if self._stop_event.wait(next_check - time.monotonic()):
+                    logging.info("Notifier stopped, shutting down")
+                    break
         except KeyboardInterrupt:
             logging.info("Caught KeyboardInterrupt, shutting down")
         except Exception as e:
             logging.error(f"Got exception while running notifier: {e}")
             logging.info(traceback.format_exc())
         finally:
+            # Stop running predictions and send remaining notifications
+            if self._prediction_executor is not None:
+                self._prediction_executor.shutdown(wait=False, cancel_futures=True)
+            self._stop_notification_worker()
+
             # Close any open connections
             self.autorx_listener.close()
@@ -1,11 +1,18 @@
-import json
 import logging
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from datetime import datetime, timezone
 from typing import Optional, Tuple
 
-import geopy.distance
+from . import geo
+
+try:
+    import orjson as json # Optional, faster JSON parser
+except ImportError:
+    import json
+
+PREDICTION_TIMEOUT = (3, 10) # Connect and read timeout in seconds for prediction requests
 
     
 class LandingPrediction:
@@ -27,10 +34,7 @@ class LandingPrediction:
         Returns distance in meters.
         """
     
-        return geopy.distance.geodesic(
-            observer,
-            (self.latitude, self.longitude)
-        ).m
+        return geo.geodesic_distance(observer, (self.latitude, self.longitude))
 
 class PredictionEngine:
     def __init__(
@@ -45,6 +49,14 @@ class PredictionEngine:
         self.burst_altitude = burst_altitude
         self.descent_rate = descent_rate
 
+        # Reuse connections to the prediction API, and retry briefly on connection errors only.
+        # Read errors and error responses aren't retried (also ignoring Retry-After), as that could stall predictions for a long time.
+        retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2, respect_retry_after_header=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+        self._session = requests.Session()
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
     def run_landing_prediction(
             self,
             start_time: datetime,
@@ -57,7 +69,7 @@ class PredictionEngine:
 
         altitude = int(altitude)
         time_formatted = start_time.isoformat().split("+")[0]
-        logging.debug(f"Running prediction for {latitude}, {longitude}, {altitude}m {'descending' if descending else 'rising'} at {time_formatted}")
+        logging.debug("Running prediction for %s, %s, %sm %s at %s", latitude, longitude, altitude, "descending" if descending else "rising", time_formatted)
 
         # If sonde is descending, set burst point to altitude to skip ascent
         if descending:
@@ -65,31 +77,33 @@ class PredictionEngine:
         else:
             burst_altitude = self.burst_altitude
 
-        # Add URL parameters
-        url = self.api_url+f"?launch_latitude={latitude}" \
-                           f"&launch_longitude={longitude}" \
-                           f"&launch_altitude={altitude}" \
-                           f"&launch_datetime={time_formatted}Z" \
-                           f"&ascent_rate={self.ascent_rate}" \
-                           f"&burst_altitude={burst_altitude}" \
-                           f"&descent_rate={self.descent_rate}"
+        # Prepare URL parameters
+        params = {
+            "launch_latitude": latitude,
+            "launch_longitude": longitude,
+            "launch_altitude": altitude,
+            "launch_datetime": time_formatted+"Z",
+            "ascent_rate": self.ascent_rate,
+            "burst_altitude": burst_altitude,
+            "descent_rate": self.descent_rate
+        }
 
         # Make request and load response json
         try:
-            request = requests.get(url, timeout=3)
+            request = self._session.get(self.api_url, params=params, timeout=PREDICTION_TIMEOUT)
         except Exception as e:
-            logging.error("Error while getting prediction from tawhiri API: "+str(e))
+            logging.error("Error while getting prediction from tawhiri API: %s", e)
             return None
 
         if request.status_code != 200:
-            logging.error(f"Tawhiri prediction API returned status code {request.status_code}: {request.text}")
+            logging.error("Tawhiri prediction API returned status code %s: %s", request.status_code, request.text)
             return None
 
         # Parse & process response
         try:
             prediction = json.loads(request.content)
         except json.JSONDecodeError as e:
-            logging.error("Error while decoding JSON response from tawhiri API: "+str(e))
+            logging.error("Error while decoding JSON response from tawhiri API: %s", e)
             return None
 
         landing_prediction = prediction["prediction"][1]["trajectory"][-1]